@@ -1,8 +1,10 @@
 # app.py
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
 import pandas as pd
-from io import BytesIO
 
 from modules import parser, skill_matcher, llm_reasoner, pdf_generator, utils
 
@@ -36,6 +38,9 @@ choice = st.sidebar.selectbox("Navigate", MENU)
 os.makedirs("data/resumes", exist_ok=True)
 os.makedirs("data/outputs", exist_ok=True)
 
+# Warm the precomputed SKILL_LIST embeddings (cached on disk after first run)
+utils.skill_list_embeddings()
+
 # ---------------------------------------------------
 # Session State Initialization
 # ---------------------------------------------------
@@ -55,6 +60,54 @@ if "gemini_configured" not in st.session_state:
     st.session_state.gemini_configured = False
 
 
+# ---------------------------------------------------
+# Analysis Helpers
+# ---------------------------------------------------
+def _analyze_one(resume_path, parsed, jd_text, jd_skills, jd_embedding):
+    """
+    Evaluate and reason about a single parsed resume.
+    Runs inside a worker thread, so it must not touch Streamlit APIs.
+    """
+    resume_text = parsed["raw_text"]
+    resume_skills = parsed["skills"]
+
+    eval_result = skill_matcher.evaluate_candidate(
+        resume_text,
+        resume_skills,
+        jd_text,
+        jd_skills,
+        jd_embedding=jd_embedding
+    )
+
+    matched = eval_result["matched_skills"]
+    missing = eval_result["missing_skills"]
+
+    reasoning = {}
+    if missing:
+        reasoning = llm_reasoner.get_skill_reasoning(matched, missing)
+
+    return {
+        "name": parsed["name"] or os.path.basename(resume_path),
+        "email": parsed.get("email"),
+        "phone": parsed.get("phone"),
+        "resume_path": resume_path,
+        "tfidf_score": eval_result["tfidf_score"],
+        "semantic_score": eval_result["semantic_score"],
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "reasoning": reasoning
+    }
+
+
+@st.cache_data
+def _ranking_df(rows):
+    """Ranking table, rebuilt only when the (name, score, matched, missing) rows change."""
+    return pd.DataFrame(
+        rows,
+        columns=["Name", "Score (%)", "Matched", "Missing"]
+    ).sort_values(by="Score (%)", ascending=False)
+
+
 # ---------------------------------------------------
 # PAGE: HOME
 # ---------------------------------------------------
@@ -111,8 +164,9 @@ elif choice == "📤 Upload Resumes":
     if uploaded_files:
         for f in uploaded_files:
             path = os.path.join("data/resumes", f.name)
+            f.seek(0)
             with open(path, "wb") as out:
-                out.write(f.getbuffer())
+                shutil.copyfileobj(f, out, length=1024 * 1024)
             if path not in st.session_state.resumes:
                 st.session_state.resumes.append(path)
 
@@ -125,14 +179,33 @@ elif choice == "📤 Upload Resumes":
 
     if uploaded_zip:
         import zipfile
-        with zipfile.ZipFile(BytesIO(uploaded_zip.getvalue()), "r") as z:
-            z.extractall("data/resumes")
-
-        for file in os.listdir("data/resumes"):
-            if file.lower().endswith(".pdf"):
-                full_path = os.path.join("data/resumes", file)
-                if full_path not in st.session_state.resumes:
-                    st.session_state.resumes.append(full_path)
+        # UploadedFile is seekable, so zipfile reads members straight from it
+        with zipfile.ZipFile(uploaded_zip, "r") as z:
+            for member in z.namelist():
+                if not member.lower().endswith(".pdf"):
+                    continue
+
+                # skip macOS metadata (__MACOSX/._resume.pdf) and hidden files
+                if member.startswith("__MACOSX/") or os.path.basename(member).startswith("."):
+                    continue
+
+                # reject absolute / ".." names (extract() would rewrite them),
+                # so the joined path below is where the member lands
+                if (
+                    member.startswith(("/", "\\"))
+                    or os.path.splitdrive(member)[0]
+                    or ".." in member.replace("\\", "/").split("/")
+                ):
+                    continue
+
+                # already extracted on an earlier rerun: skip the disk write
+                full_path = os.path.normpath(os.path.join("data/resumes", member))
+                if full_path in st.session_state.resumes:
+                    continue
+
+                extracted = os.path.normpath(z.extract(member, "data/resumes"))
+                if extracted not in st.session_state.resumes:
+                    st.session_state.resumes.append(extracted)
 
         st.success("ZIP file extracted and resumes added.")
 
@@ -174,83 +247,88 @@ elif choice == "📊 Analyze Candidates":
             st.error("Paste a job description.")
         else:
             st.info("Analyzing resumes...")
-            results = []
             progress = st.progress(0)
             total = len(st.session_state.resumes)
 
-            for i, resume_path in enumerate(st.session_state.resumes):
-                parsed = parser.parse_resume(
-                    resume_path,
+            # JD is parsed and embedded once, not per resume
+            jd_skills = parser.extract_skills_from_text(jd_text, utils.SKILL_LIST)
+            jd_embedding = skill_matcher.encode_text(jd_text)
+
+            # Resumes are parsed in SBERT-batch-sized chunks; parsing is the
+            # slow phase, so it drives the first half of the progress bar
+            resumes = st.session_state.resumes
+            parsed_resumes = []
+            for start in range(0, total, parser.PARSE_BATCH_SIZE):
+                parsed_resumes += parser.parse_resumes_batch(
+                    resumes[start:start + parser.PARSE_BATCH_SIZE],
                     utils.SKILL_LIST,
                     use_semantic=True
                 )
+                progress.progress(len(parsed_resumes) / (2 * total))
+
+            results = [None] * total
+            with ThreadPoolExecutor(max_workers=min(8, total)) as executor:
+                futures = {
+                    executor.submit(
+                        _analyze_one,
+                        resume_path,
+                        parsed,
+                        jd_text,
+                        jd_skills,
+                        jd_embedding
+                    ): i
+                    for i, (resume_path, parsed) in enumerate(
+                        zip(resumes, parsed_resumes)
+                    )
+                }
+
+                for done, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    progress.progress((total + done) / (2 * total))
+
+            # Final scores for every candidate in one vectorized pass
+            final_scores = skill_matcher.combined_scores_batch(
+                [r["tfidf_score"] for r in results],
+                [r["semantic_score"] for r in results],
+                semantic_weight
+            )
 
-                resume_text = parsed["raw_text"]
-                resume_skills = parsed["skills"]
-                jd_skills = parser.extract_skills_from_text(jd_text, utils.SKILL_LIST)
-
-                eval_result = skill_matcher.evaluate_candidate(
-                    resume_text,
-                    resume_skills,
-                    jd_text,
-                    jd_skills
-                )
-
-                final_score = (
-                    (1 - semantic_weight) * eval_result["tfidf_score"]
-                    + semantic_weight * eval_result["semantic_score"]
-                ) * 100
-
-                matched = eval_result["matched_skills"]
-                missing = eval_result["missing_skills"]
-
-                reasoning = {}
-                if missing:
-                    reasoning = llm_reasoner.get_skill_reasoning(matched, missing)
-
-                name = parsed["name"] or os.path.basename(resume_path)
-                pdf_path = os.path.join(
-                    "data/outputs",
-                    f"{name.replace(' ', '_')}.pdf"
-                )
+            for r, final_score in zip(results, final_scores):
+                r["final_score"] = float(final_score)
+
+            # One PDF report per candidate, written atomically to data/outputs
+            report_paths = pdf_generator.generate_candidate_reports_batch(
+                [
+                    {
+                        "name": r["name"],
+                        "email": r["email"] or "",
+                        "phone": r["phone"] or "",
+                        "final_score": r["final_score"],
+                        "matched_skills": r["matched_skills"],
+                        "missing_skills": r["missing_skills"],
+                        "reasoning": r["reasoning"]
+                    }
+                    for r in results
+                ],
+                "data/outputs"
+            )
 
-                pdf_generator.generate_candidate_report({
-                    "name": name,
-                    "email": parsed.get("email", ""),
-                    "phone": parsed.get("phone", ""),
-                    "final_score": round(final_score, 2),
-                    "matched_skills": matched,
-                    "missing_skills": missing,
-                    "reasoning": reasoning
-                }, pdf_path)
-
-                results.append({
-                    "name": name,
-                    "email": parsed.get("email"),
-                    "phone": parsed.get("phone"),
-                    "resume_path": resume_path,
-                    "final_score": round(final_score, 2),
-                    "matched_skills": matched,
-                    "missing_skills": missing,
-                    "reasoning": reasoning,
-                    "report_path": pdf_path
-                })
-
-                progress.progress((i + 1) / total)
+            for r, report_path in zip(results, report_paths):
+                r["report_path"] = report_path
 
             st.session_state.analysis_results = results
             st.success("Analysis complete!")
 
     if st.session_state.analysis_results:
-        df = pd.DataFrame([
-            {
-                "Name": r["name"],
-                "Score (%)": r["final_score"],
-                "Matched": len(r["matched_skills"]),
-                "Missing": len(r["missing_skills"])
-            }
+        df = _ranking_df(tuple(
+            (
+                r["name"],
+                r["final_score"],
+                len(r["matched_skills"]),
+                len(r["missing_skills"])
+            )
             for r in st.session_state.analysis_results
-        ]).sort_values(by="Score (%)", ascending=False)
+        ))
 
         st.subheader("📊 Candidate Ranking")
         st.dataframe(df, use_container_width=True)
@@ -265,11 +343,10 @@ elif choice == "🔎 Top Candidate Preview":
     if not st.session_state.analysis_results:
         st.info("Run analysis first.")
     else:
-        top = sorted(
+        top = max(
             st.session_state.analysis_results,
-            key=lambda x: x["final_score"],
-            reverse=True
-        )[0]
+            key=lambda x: x["final_score"]
+        )
 
         text = parser.extract_text_from_pdf(top["resume_path"])
         preview = text[:1500] + ("..." if len(text) > 1500 else "")
@@ -4,9 +4,25 @@ import google.generativeai as genai
 
 import json
 import re
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+
 # Global model reference
 _MODEL = None
 
+# Cap concurrent Gemini calls (analysis runs resumes in parallel)
+_GEMINI_SEMAPHORE = threading.Semaphore(4)
+
+# Outermost {...} block in the model reply (tolerates ```json fences / prose)
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+
+# Gemini calls still in flight, keyed like _cached_reason; concurrent
+# candidates with the same skill gap wait on one call instead of each
+# missing the cache
+_PENDING = {}
+_PENDING_LOCK = threading.Lock()
+
 
 def configure_gemini(api_key: str):
     """
@@ -23,18 +39,21 @@ def configure_gemini(api_key: str):
     )
 
 
-def get_skill_reasoning(matched_skills, missing_skills):
-    if _MODEL is None:
-        raise RuntimeError("Gemini is not configured")
-
+@lru_cache(maxsize=1024)
+def _cached_reason(matched_key: tuple, missing_key: tuple) -> str:
+    """
+    JSON object text from Gemini's reply for a (matched, missing) skill set.
+    Raises ValueError when the reply holds no JSON object, so a truncated
+    or refused reply is retried next time instead of being cached.
+    """
     prompt = f"""
 You are an AI career advisor.
 
 Matched skills:
-{matched_skills}
+{list(matched_key)}
 
 Missing skills:
-{missing_skills}
+{list(missing_key)}
 
 Return ONLY valid JSON in this exact format:
 
@@ -50,13 +69,53 @@ Return ONLY valid JSON in this exact format:
 }}
 """
 
-    response = _MODEL.generate_content(prompt)
-    text = response.text.strip()
+    # Stream so decoding overlaps the network transfer
+    with _GEMINI_SEMAPHORE:
+        response = _MODEL.generate_content(prompt, stream=True)
+        text = "".join(chunk.text for chunk in response).strip()
 
     # 🔒 Extract JSON safely
+    match = _JSON_RE.search(text)
+    if not match:
+        raise ValueError("Gemini reply has no JSON object")
+
+    # validate before caching; JSONDecodeError is a ValueError
+    if not isinstance(json.loads(match.group()), dict):
+        raise ValueError("Gemini reply is not a JSON object")
+    return match.group()
+
+
+def _reason(key: tuple) -> str:
+    """_cached_reason(*key), sharing one call among concurrent callers."""
+    with _PENDING_LOCK:
+        future = _PENDING.get(key)
+        owner = future is None
+        if owner:
+            future = _PENDING[key] = Future()
+
+    if owner:
+        try:
+            future.set_result(_cached_reason(*key))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with _PENDING_LOCK:
+                del _PENDING[key]
+
+    return future.result()
+
+
+def get_skill_reasoning(matched_skills, missing_skills):
+    if _MODEL is None:
+        raise RuntimeError("Gemini is not configured")
+
     try:
-        json_text = re.search(r"\{.*\}", text, re.S).group()
-        parsed = json.loads(json_text)
-        return parsed if isinstance(parsed, dict) else {}
-    except Exception:
+        text = _reason((
+            tuple(sorted(matched_skills)),
+            tuple(sorted(missing_skills))
+        ))
+    except ValueError:
         return {}
+
+    # parsed per call: each candidate gets its own dict
+    return json.loads(text)
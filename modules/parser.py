@@ -1,22 +1,33 @@
 """
 parser.py (cloud-safe, high-accuracy)
 
-- Uses pdfplumber instead of PyMuPDF (Streamlit Cloud compatible)
-- Uses spaCy transformer model (en_core_web_trf) if available
+- Uses PyMuPDF for fast text extraction, pdfplumber where PyMuPDF is unavailable
+- Uses spaCy en_core_web_sm (NER only) for name extraction
 - Falls back to en_core_web_md
 - Uses phonenumbers for robust phone extraction
 - Optional semantic skill detection using sentence-transformers
+  (shared model from utils: int8 ONNX Runtime on CPU, FP16 on CUDA)
 """
 
 from typing import List, Dict, Optional
+import os
 import re
 import json
+import zlib
+import pickle
+import hashlib
 import logging
+import threading
 
 # -----------------------------
-# PDF Parsing (CLOUD SAFE)
+# PDF Parsing (PyMuPDF, pdfplumber fallback)
 # -----------------------------
-import pdfplumber
+try:
+    import fitz  # PyMuPDF
+    PDF_BACKEND = "pymupdf"
+except ImportError:
+    import pdfplumber
+    PDF_BACKEND = "pdfplumber"
 
 # -----------------------------
 # Phone number extraction
@@ -27,47 +38,81 @@ import phonenumbers
 # spaCy (NER)
 # -----------------------------
 import spacy
+
+# Only NER is used (candidate name), so the other pipes are skipped
+_SPACY_DISABLE = ["tagger", "parser", "lemmatizer", "attribute_ruler"]
 try:
-    nlp = spacy.load("en_core_web_trf")
-    logging.info("Loaded spaCy transformer model: en_core_web_trf")
+    nlp = spacy.load("en_core_web_sm", disable=_SPACY_DISABLE)
+    logging.info("Loaded spaCy model: en_core_web_sm (NER only)")
 except Exception:
     try:
-        nlp = spacy.load("en_core_web_md")
-        logging.warning("en_core_web_trf not available, falling back to en_core_web_md")
+        nlp = spacy.load("en_core_web_md", disable=_SPACY_DISABLE)
+        logging.warning("en_core_web_sm not available, falling back to en_core_web_md")
     except Exception as e:
         raise RuntimeError(
-            "spaCy model not found. Install en_core_web_trf or en_core_web_md"
+            "spaCy model not found. Install en_core_web_sm or en_core_web_md"
         ) from e
 
 # -----------------------------
 # sentence-transformers (semantic skills)
 # -----------------------------
+from modules.utils import load_semantic_model, skill_list_embeddings, SKILL_LIST
+
 try:
-    from sentence_transformers import SentenceTransformer, util
+    EMB_MODEL, DEVICE, SBERT_BACKEND = load_semantic_model()
     SBERT_AVAILABLE = True
-    EMB_MODEL = SentenceTransformer("all-mpnet-base-v2")
 except Exception:
     SBERT_AVAILABLE = False
     EMB_MODEL = None
+    DEVICE = "cpu"
+    SBERT_BACKEND = None
+
+# Skill-label embeddings, keyed by tuple(skills_list)
+_SKILL_CACHE = {}
+
+# Compiled skill regexes + canonical-casing lookups, keyed by tuple(skills_list)
+_SKILL_RE_CACHE = {}
 
 # -----------------------------
 # Regex patterns
 # -----------------------------
 EMAIL_REGEX = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 
+# "First Last" on a line of its own (typical resume header)
+NAME_LINE_REGEX = re.compile(r"^[A-Z][a-z]+ [A-Z][a-z]+$")
+
+# Last-resort NER scan is capped to the start of the resume
+NAME_FALLBACK_CHARS = 3000
+
+# Minimum cosine score for a semantic skill hit
+SEMANTIC_THRESHOLD = 0.68
+
+# mpnet truncates at 384 tokens; don't tokenize text it would drop anyway
+SEMANTIC_CHAR_LIMIT = 2000
+
+# Resumes per SBERT encode batch (callers can chunk on it to report progress)
+PARSE_BATCH_SIZE = 16
+
+# Parsed resumes, keyed by PDF content + parse settings
+PARSE_CACHE_DIR = os.path.join("data", "outputs", "parse_cache")
+
+# Bump when the parsing pipeline changes so stale entries are skipped
+PARSE_CACHE_VERSION = 2
+
 
 # =========================================================
 # PDF TEXT EXTRACTION
 # =========================================================
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF using pdfplumber (cloud-safe)."""
-    text = ""
+    """Extract text from PDF using PyMuPDF (pdfplumber if not installed)."""
+    if PDF_BACKEND == "pymupdf":
+        with fitz.open(file_path) as doc:
+            return "\n".join(page.get_text("text") for page in doc)
+
+    # pdfminer is pure Python (holds the GIL), so pages are read serially
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+        texts = [page.extract_text() for page in pdf.pages]
+        return "".join(t + "\n" for t in texts if t)
 
 
 # =========================================================
@@ -109,9 +154,15 @@ def extract_name(text: str) -> Optional[str]:
         if ent.label_ == "PERSON":
             return ent.text.strip()
 
-    # fallback: full scan
-    doc_full = nlp(text)
-    for ent in doc_full.ents:
+    # fallback: "First Last" line near the top
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[:5]:
+        if NAME_LINE_REGEX.match(line):
+            return line
+
+    # last resort: NER over the start of the document
+    doc_start = nlp(text[:NAME_FALLBACK_CHARS])
+    for ent in doc_start.ents:
         if ent.label_ == "PERSON":
             return ent.text.strip()
 
@@ -125,53 +176,119 @@ def _normalize_skill(s: str) -> str:
     return s.strip().lower()
 
 
+def _skill_alternative(skill: str) -> str:
+    # Word boundaries only on word-character ends: "c++" / "c#" must still
+    # match in "c++11" / "c#.net" rather than backtracking to "c"
+    return (
+        (r"(?<!\w)" if skill[0].isalnum() else "")
+        + re.escape(skill)
+        + (r"(?!\w)" if skill[-1].isalnum() else "")
+    )
+
+
+def _get_skill_regex(skills_list: List[str]):
+    """
+    One alternation regex over all skills, built once per skill list.
+    Longest skills come first so "c++" wins over "c"; the lookarounds
+    stop "c" matching inside words.
+    """
+    key = tuple(skills_list)
+    if key not in _SKILL_RE_CACHE:
+        normalized = sorted(
+            (s for s in dict.fromkeys(map(_normalize_skill, skills_list)) if s),
+            key=len,
+            reverse=True
+        )
+        alternation = "|".join(_skill_alternative(s) for s in normalized)
+        # case-sensitive on purpose: text is lowercased once before scanning
+        pattern = re.compile(f"(?:{alternation})" if alternation else "(?!)")
+        canonical = {}
+        for s in skills_list:
+            canonical.setdefault(_normalize_skill(s), s)
+        _SKILL_RE_CACHE[key] = (pattern, canonical)
+    return _SKILL_RE_CACHE[key]
+
+
+def _match_skills(text_low: str, skills_list: List[str]) -> List[str]:
+    """
+    Skills occurring as whole words in already-lowercased `text_low`,
+    deduplicated, in text order.
+    """
+    if not skills_list:
+        return []
+
+    pattern, canonical = _get_skill_regex(skills_list)
+    return list(dict.fromkeys(
+        canonical[m] for m in pattern.findall(text_low)
+    ))
+
+
 def extract_skills_by_keyword(text: str, skills_list: List[str]) -> List[str]:
-    text_low = text.lower()
-    found = []
+    return _match_skills(text.lower(), skills_list)
+
+
+def _get_skill_embs(skills_list: List[str]):
+    """Unit-normalized skill-label embeddings, encoded once per skill list."""
+    key = tuple(skills_list)
+    if key not in _SKILL_CACHE:
+        if key == SKILL_LIST:
+            # the precomputed matrix skill_matcher uses: no second forward
+            # pass (torch.tensor copies, so the read-only mmap is fine)
+            import torch
+            _SKILL_CACHE[key] = torch.tensor(skill_list_embeddings(), device=DEVICE)
+        else:
+            _SKILL_CACHE[key] = EMB_MODEL.encode(
+                skills_list,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                device=DEVICE
+            )
+    return _SKILL_CACHE[key]
 
-    for s in skills_list:
-        if _normalize_skill(s) in text_low:
-            found.append(s)
 
-    # deduplicate
-    return list(dict.fromkeys(found))
+def match_semantic(resume_embs, skill_embs, threshold: float = SEMANTIC_THRESHOLD):
+    """
+    Boolean mask of shape (resumes, skills): cosine score >= threshold.
+    Both inputs must be unit-normalized, so cosine is a plain matmul.
+    """
+    return (resume_embs @ skill_embs.T) >= threshold
 
 
 def extract_skills_semantic(
     text: str,
     skills_list: List[str],
-    threshold: float = 0.68
+    threshold: float = SEMANTIC_THRESHOLD
 ) -> List[str]:
     if not SBERT_AVAILABLE:
         return []
 
-    resume_emb = EMB_MODEL.encode(text, convert_to_tensor=True)
-    skill_embs = EMB_MODEL.encode(skills_list, convert_to_tensor=True)
+    resume_emb = EMB_MODEL.encode(
+        [text[:SEMANTIC_CHAR_LIMIT]],
+        convert_to_tensor=True,
+        normalize_embeddings=True,
+        device=DEVICE
+    )
+    skill_embs = _get_skill_embs(skills_list)
 
-    scores = util.cos_sim(resume_emb, skill_embs)[0].cpu().tolist()
-    return [skills_list[i] for i, score in enumerate(scores) if score >= threshold]
+    mask = match_semantic(resume_emb, skill_embs, threshold)[0]
+    indices = mask.nonzero(as_tuple=True)[0].tolist()
+    return [skills_list[i] for i in indices]
 
 
 # =========================================================
 # MAIN RESUME PARSER
 # =========================================================
-def parse_resume(
-    file_path: str,
+def _build_parsed_resume(
+    raw_text: str,
     skills_list: List[str],
-    use_semantic: bool = True
+    semantic_skills: List[str]
 ) -> Dict:
-    raw_text = extract_text_from_pdf(file_path)
-
     name = extract_name(raw_text)
     email = extract_email(raw_text)
     phone = extract_phone(raw_text)
 
-    keyword_skills = extract_skills_by_keyword(raw_text, skills_list)
-
-    semantic_skills = []
-    if use_semantic and SBERT_AVAILABLE:
-        semantic_skills = extract_skills_semantic(raw_text, skills_list)
-
+    # lowercase once; NER/email/phone above need the original casing
+    keyword_skills = _match_skills(raw_text.lower(), skills_list)
     combined_skills = list(dict.fromkeys(semantic_skills + keyword_skills))
 
     return {
@@ -183,18 +300,137 @@ def parse_resume(
     }
 
 
+def parse_resume(
+    file_path: str,
+    skills_list: List[str],
+    use_semantic: bool = True
+) -> Dict:
+    return parse_resumes_batch([file_path], skills_list, use_semantic)[0]
+
+
+def parse_resumes_batch(
+    file_paths: List[str],
+    skills_list: List[str],
+    use_semantic: bool = True
+) -> List[Dict]:
+    """
+    Parse several resumes, encoding all of them with SBERT in one batched
+    call instead of one call per resume. Output order matches `file_paths`.
+    Unchanged files are served from the on-disk parse cache.
+    """
+    use_semantic = use_semantic and SBERT_AVAILABLE
+
+    keys = [
+        _parse_cache_key(path, skills_list, use_semantic)
+        for path in file_paths
+    ]
+    results = [_load_cached_parse(key) for key in keys]
+
+    misses = [i for i, parsed in enumerate(results) if parsed is None]
+    if not misses:
+        return results
+
+    texts = [extract_text_from_pdf(file_paths[i]) for i in misses]
+
+    semantic_hits = [[] for _ in texts]
+    if use_semantic:
+        resume_embs = EMB_MODEL.encode(
+            [text[:SEMANTIC_CHAR_LIMIT] for text in texts],
+            batch_size=PARSE_BATCH_SIZE,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+            device=DEVICE
+        )
+        skill_embs = _get_skill_embs(skills_list)
+
+        # only the (resume, skill) hit pairs leave the device
+        mask = match_semantic(resume_embs, skill_embs)
+        for row, col in mask.nonzero().tolist():
+            semantic_hits[row].append(skills_list[col])
+
+    for i, raw_text, hits in zip(misses, texts, semantic_hits):
+        results[i] = _build_parsed_resume(raw_text, skills_list, hits)
+        _store_cached_parse(keys[i], results[i])
+
+    return results
+
+
+# =========================================================
+# PARSE CACHE
+# =========================================================
+def _parse_cache_key(
+    file_path: str,
+    skills_list: List[str],
+    use_semantic: bool
+) -> str:
+    """BLAKE2b of the PDF bytes plus every setting that changes the result."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(
+        repr((
+            PARSE_CACHE_VERSION,
+            tuple(skills_list),
+            use_semantic,
+            SEMANTIC_THRESHOLD,
+            SEMANTIC_CHAR_LIMIT,
+            SBERT_BACKEND,
+            PDF_BACKEND
+        )).encode()
+    )
+    return digest.hexdigest()
+
+
+def _load_cached_parse(key: str) -> Optional[Dict]:
+    path = os.path.join(PARSE_CACHE_DIR, f"{key}.pkl")
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+        entry["raw_text"] = zlib.decompress(entry["raw_text"]).decode("utf-8")
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logging.warning("Ignoring unreadable parse cache entry: %s", path)
+        return None
+    return entry
+
+
+def _store_cached_parse(key: str, parsed: Dict) -> None:
+    path = os.path.join(PARSE_CACHE_DIR, f"{key}.pkl")
+    entry = dict(
+        parsed,
+        raw_text=zlib.compress(parsed["raw_text"].encode("utf-8"))
+    )
+
+    # write-then-rename so concurrent readers never see a partial file;
+    # Streamlit sessions are threads of one process, so the pid alone
+    # does not make the temp name unique
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        # the parse itself succeeded; a cache miss next time is harmless
+        logging.warning("Could not write parse cache entry: %s", path)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 # =========================================================
 # JD SKILL EXTRACTION
 # =========================================================
 def extract_skills_from_text(text: str, skill_list: list):
-    text_lower = text.lower()
-    return list({
-        skill for skill in skill_list if skill.lower() in text_lower
-    })
+    return _match_skills(text.lower(), skill_list)
 
 
 # =========================================================
-# CLI TEST
+# CLI TEST (from the repo root: python -m modules.parser)
 # =========================================================
 if __name__ == "__main__":
     SKILLS = [
@@ -203,7 +439,7 @@ if __name__ == "__main__":
         "Tableau", "Power BI"
     ]
 
-    sample = "../data/resumes/sample_resume.pdf"
+    sample = os.path.join("data", "resumes", "sample_resume.pdf")
     res = parse_resume(sample, SKILLS, use_semantic=True)
 
     print(json.dumps(
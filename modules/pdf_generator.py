@@ -1,199 +1,161 @@
-"""
-parser.py (upgraded)
-
-- Uses spaCy transformer model (en_core_web_trf) if available (fallback to en_core_web_sm).
-- Uses phonenumbers for robust phone extraction.
-- Optional semantic skill detection using sentence-transformers.
-"""
-
-from typing import List, Dict, Optional
-import re
-import fitz  # PyMuPDF
-import json
-import logging
-
-# improved phone detection
-import phonenumbers
-
-# spaCy (transformer if available)
-import spacy
-try:
-    # prefer transformer model for higher NER accuracy
-    nlp = spacy.load("en_core_web_trf")
-    logging.info("Loaded spaCy transformer model: en_core_web_trf")
-except Exception:
-    try:
-        nlp = spacy.load("en_core_web_md")
-        logging.warning("en_core_web_trf not available, falling back to en_core_web_sm")
-    except Exception as e:
-        raise RuntimeError("spaCy model not found. Install en_core_web_trf or en_core_web_md") from e
-
-# sentence-transformers (optional, for semantic skill matching)
-try:
-    from sentence_transformers import SentenceTransformer, util
-    SBERT_AVAILABLE = True
-    EMB_MODEL = SentenceTransformer("all-mpnet-base-v2")  # high-accuracy embedding
-except Exception:
-    SBERT_AVAILABLE = False
-    EMB_MODEL = None
-
-# Basic email regex (robust)
-EMAIL_REGEX = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
-
-
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF using PyMuPDF."""
-    text = ""
-    with fitz.open(file_path) as pdf:
-        for page in pdf:
-            text += page.get_text("text")
-    return text
-
-
-def extract_email(text: str) -> Optional[str]:
-    """Extract the first email address found."""
-    match = EMAIL_REGEX.search(text)
-    return match.group(0) if match else None
-
-
-def extract_phone(text: str, default_region: str = "IN") -> Optional[str]:
+# modules/pdf_generator.py
+
+import os
+import threading
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+# Skip attribute validation on reportlab.graphics shapes (drawings only;
+# the platypus Paragraph/Spacer flowables below never read this flag).
+# Set PDF_DEBUG=1 to keep ReportLab's checks on.
+if not os.getenv("PDF_DEBUG"):
+    rl_config.shapeChecking = 0
+
+# -----------------------------
+# Styles (built once at import, shared by every report)
+# -----------------------------
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    "ReportTitle",
+    parent=_STYLES["Title"],
+    fontSize=20,
+    spaceAfter=12,
+)
+
+_SECTION_STYLE = ParagraphStyle(
+    "ReportSection",
+    parent=_STYLES["Heading2"],
+    textColor=colors.HexColor("#1F3A93"),
+    spaceBefore=10,
+    spaceAfter=6,
+)
+
+_NORMAL_STYLE = ParagraphStyle(
+    "ReportNormal",
+    parent=_STYLES["Normal"],
+    fontSize=10,
+    leading=14,
+)
+
+_BULLET_STYLE = ParagraphStyle(
+    "ReportBullet",
+    parent=_NORMAL_STYLE,
+    leftIndent=12,
+)
+
+
+def _p(text, style=_NORMAL_STYLE):
+    """Paragraph from plain text (escaped: LLM output may contain < or &)."""
+    return Paragraph(escape(str(text)), style)
+
+
+def _bullets(items) -> list:
     """
-    Extract phone number using phonenumbers library for robust international parsing.
-    Returns the first valid number in E.164 format if possible.
+    All bullet lines in a single Paragraph joined by <br/>: one flowable
+    for ReportLab to lay out instead of one per line.
     """
-    if not text:
-        return None
-    for match in phonenumbers.PhoneNumberMatcher(text, default_region):
-        num = match.number
-        if phonenumbers.is_valid_number(num):
-            return phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164)
-    # fallback: try simple regex (10 digits)
-    regex = re.compile(r"(\+?\d{1,3}[-.\s]?)?(\d{10})")
-    m = regex.search(text)
-    if m:
-        return m.group(0)
-    return None
-
-
-def extract_name(text: str) -> Optional[str]:
-    """
-    Extract name using spaCy's PERSON entity. Transformer model will give better accuracy.
-    We return the first PERSON entity found near the top of the document (likely the candidate name).
-    """
-    if not text:
-        return None
-    # Consider only first N lines to prioritize header
-    header = "\n".join(text.splitlines()[:15])
-    doc = nlp(header)
-    names = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
-    if names:
-        return names[0]
-    # fallback: full doc scan
-    doc_full = nlp(text)
-    for ent in doc_full.ents:
-        if ent.label_ == "PERSON":
-            return ent.text.strip()
-    return None
-
-
-def _normalize_skill(s: str) -> str:
-    return s.strip().lower()
-
-
-def extract_skills_by_keyword(text: str, skills_list: List[str]) -> List[str]:
+    lines = [f"• {escape(str(item))}" for item in items]
+    return [Paragraph("<br/>".join(lines), _BULLET_STYLE)] if lines else []
+
+
+def _reasoning_flowables(skill, info: dict) -> list:
+    """Heading, explanation and course bullets for one missing skill."""
+    return [
+        Paragraph(f"<b>{escape(str(skill))}</b>", _NORMAL_STYLE),
+        *([_p(f"Related to: {info['related_to']}", _BULLET_STYLE)] if info.get("related_to") else []),
+        *([_p(info["explanation"], _BULLET_STYLE)] if info.get("explanation") else []),
+        *_bullets(
+            f"{course.get('title', '')} ({course.get('provider', '')})"
+            for course in info.get("courses", [])
+            if isinstance(course, dict)
+        ),
+        Spacer(1, 4),
+    ]
+
+
+# =========================================================
+# CANDIDATE REPORT
+# =========================================================
+def render_candidate_report(candidate: dict) -> bytes:
     """
-    Extract skills by exact/substring keyword match (case-insensitive).
-    This is fast and OK for obvious matches.
+    Build an ATS-style PDF report for one analyzed candidate in memory.
+
+    `candidate` carries name, email, phone, final_score, matched_skills,
+    missing_skills and reasoning (as returned by llm_reasoner).
     """
-    text_low = text.lower()
-    found = []
-    for s in skills_list:
-        if _normalize_skill(s) in text_low:
-            found.append(s)
-    # deduplicate while preserving order
-    seen = set()
-    result = []
-    for x in found:
-        if x not in seen:
-            result.append(x)
-            seen.add(x)
-    return result
-
-
-def extract_skills_semantic(text: str, skills_list: List[str], threshold: float = 0.65) -> List[str]:
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+
+    reasoning = candidate.get("reasoning") or {}
+
+    content = [
+        _p("Candidate Report", _TITLE_STYLE),
+        _p(f"Name: {candidate.get('name') or 'N/A'}"),
+        _p(f"Email: {candidate.get('email') or 'N/A'}"),
+        _p(f"Phone: {candidate.get('phone') or 'N/A'}"),
+        _p(f"Match Score: {candidate.get('final_score', 0)}%"),
+        Spacer(1, 6),
+
+        _p("Matched Skills", _SECTION_STYLE),
+        *_bullets(candidate.get("matched_skills", [])),
+
+        _p("Missing Skills", _SECTION_STYLE),
+        *_bullets(candidate.get("missing_skills", [])),
+
+        *([_p("AI Reasoning & Course Recommendations", _SECTION_STYLE)] if reasoning else []),
+        *[
+            flowable
+            for skill, info in reasoning.items()
+            if isinstance(info, dict)
+            for flowable in _reasoning_flowables(skill, info)
+        ],
+    ]
+
+    doc.build(content)
+    return buffer.getvalue()
+
+
+def generate_candidate_report(candidate: dict, output_path: str) -> str:
     """
-    Use SBERT to compute semantic similarity between resume text and each skill label.
-    Returns skills whose cosine similarity passes the threshold.
-    Requires sentence-transformers installed.
+    Write the candidate's PDF report to `output_path` in one write.
+    The file is replaced atomically, so a download never sees a partial
+    report. Returns `output_path`.
     """
-    if not SBERT_AVAILABLE:
-        raise RuntimeError("sentence-transformers not installed. Install it to use semantic matching.")
+    pdf_bytes = render_candidate_report(candidate)
 
-    # encode resume as a short representation — we can either encode full text or important sentences
-    resume_emb = EMB_MODEL.encode(text, convert_to_tensor=True)
-    skill_texts = [s for s in skills_list]
-    skill_embs = EMB_MODEL.encode(skill_texts, convert_to_tensor=True)
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, output_path)
+    return output_path
 
-    cos_scores = util.cos_sim(resume_emb, skill_embs)[0].cpu().tolist()
-    matched = [skill_texts[i] for i, score in enumerate(cos_scores) if score >= threshold]
-    return matched
 
-
-def parse_resume(file_path: str, skills_list: List[str], use_semantic: bool = True) -> Dict:
+def generate_candidate_reports_batch(candidates: list, out_dir: str) -> list:
     """
-    Parse resume and return structured data. If use_semantic=True and SBERT is available,
-    semantic skill matching will be attempted and merged with keyword matches.
+    Write one report per candidate into `out_dir` (named after the
+    candidate) and return the report paths in `candidates` order.
+    Built inline: a one-page report takes milliseconds, and worker
+    processes would re-run the Streamlit script on spawn.
     """
-    raw_text = extract_text_from_pdf(file_path)
-    name = extract_name(raw_text)
-    email = extract_email(raw_text)
-    phone = extract_phone(raw_text)
-
-    # Keyword matches (fast)
-    keyword_skills = extract_skills_by_keyword(raw_text, skills_list)
-
-    # Semantic matches (optional, better recall)
-    semantic_skills = []
-    if use_semantic and SBERT_AVAILABLE:
-        try:
-            semantic_skills = extract_skills_semantic(raw_text, skills_list, threshold=0.68)
-        except Exception:
-            semantic_skills = []
-
-    # merge keyword + semantic, with semantic taking precedence for uniqueness
-    combined = list(dict.fromkeys(semantic_skills + keyword_skills))
-
-    return {
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "skills": combined,
-        "raw_text": raw_text
-    }
-
-
-# Quick CLI test
-if __name__ == "__main__":
-    SKILLS = [
-        "Python", "Machine Learning", "Deep Learning", "NLP",
-        "TensorFlow", "PyTorch", "Flask", "Django", "SQL", "Tableau", "Power BI"
+    os.makedirs(out_dir, exist_ok=True)
+    return [
+        generate_candidate_report(
+            c, os.path.join(out_dir, f"{c['name'].replace(' ', '_')}.pdf")
+        )
+        for c in candidates
     ]
-    sample = "../data/resumes/sample_resume.pdf"
-    res = parse_resume(sample, SKILLS, use_semantic=True)
-    print(json.dumps({k: v for k, v in res.items() if k != "raw_text"}, indent=2))
-# ---------------------------------------------------------
-# Extract skills from JD text (simple keyword matching)
-# ---------------------------------------------------------
-def extract_skills_from_text(text: str, skill_list: list):
-    """
-    Extract skills from job description text using keyword matching.
-    Returns: list of detected skills.
-    """
-    text_lower = text.lower()
-    found = []
-
-    for skill in skill_list:
-        if skill.lower() in text_lower:
-            found.append(skill)
-
-    return list(set(found))
\ No newline at end of file
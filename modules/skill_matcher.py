@@ -1,12 +1,119 @@
 # modules/skill_matcher.py
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+from functools import lru_cache
+
 import numpy as np
 
-# Load semantic model once (VERY IMPORTANT for performance & accuracy)
-SEMANTIC_MODEL = SentenceTransformer("all-mpnet-base-v2")
+from modules.utils import load_semantic_model, skill_list_embeddings, SKILL_INDEX
+
+# Threshold tuned for MAX accuracy (JD skill vs. closest resume skill)
+SKILL_MATCH_THRESHOLD = 0.70
+
+
+# Heavy dependencies (torch + model weights, sklearn) load on first use,
+# so importing this module stays cheap; TF-IDF-only callers never load torch
+def _get_model():
+    """Semantic model shared with parser.py (int8 ONNX on CPU, FP16 on CUDA)."""
+    return load_semantic_model()[0]
+
+
+@lru_cache(maxsize=1)
+def _get_hashing_vectorizer():
+    # Stateless (no vocabulary to fit), so one instance is safe to share
+    # across the analysis worker threads
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(
+        stop_words="english",
+        n_features=2 ** 18,
+        alternate_sign=False,
+        norm=None
+    )
+
+
+def compute_tfidf_similarity(text_a: str, text_b: str) -> float:
+    """
+    TF-IDF cosine similarity between two texts, with IDF fitted on the
+    pair over hashed term counts (no per-call vocabulary build).
+    """
+    if not text_a.strip() or not text_b.strip():
+        return 0.0
+    if text_a == text_b:
+        return 1.0
+
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    counts = _get_hashing_vectorizer().transform([text_a, text_b])
+    # fresh transformer per call: IDF state stays local to this thread
+    matrix = TfidfTransformer().fit_transform(counts)
+    # rows are already L2-normalized, so cosine is a sparse dot product
+    return float(matrix[0].multiply(matrix[1]).sum())
+
+
+@lru_cache(maxsize=128)
+def _encode(text: str):
+    emb = _get_model().encode(
+        text,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    emb.setflags(write=False)  # shared by every caller of the cache
+    return emb
+
+
+def encode_text(text: str):
+    """
+    Encode a single text with the semantic model (unit-normalized).
+    Results are memoized, so the JD is embedded once per run however
+    many candidates are scored against it.
+    """
+    return _encode(text)
+
+
+def compute_semantic_similarity(text_a: str, text_b: str, emb_b=None) -> float:
+    """
+    Cosine similarity of two texts' embeddings. Pass `emb_b` (from
+    `encode_text`) to reuse an already-encoded text_b.
+    """
+    if not text_a.strip() or not text_b.strip():
+        return 0.0
+    if text_a == text_b:
+        return 1.0
+
+    if emb_b is None:
+        emb_b = encode_text(text_b)
+    return float(encode_text(text_a) @ emb_b)
+
+
+def _encode_skills(skills: list):
+    """
+    Normalized embeddings for lowercase skill labels. Skills from
+    utils.SKILL_LIST are looked up in the precomputed matrix; only
+    unknown labels go through the model.
+    """
+    known = skill_list_embeddings()
+    rows = [SKILL_INDEX.get(s) for s in skills]
+    if None not in rows:
+        return known[rows]
+
+    fresh = iter(_get_model().encode(
+        [s for s, row in zip(skills, rows) if row is None],
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    ))
+    return np.stack([known[row] if row is not None else next(fresh) for row in rows])
+
+
+def combined_scores_batch(tfidf_scores, semantic_scores, semantic_weight: float):
+    """
+    Final match scores (%) for many candidates in one vectorized pass:
+    (1 - w) * tfidf + w * semantic, rounded to 2 decimals.
+    """
+    tfidf = np.ascontiguousarray(tfidf_scores, dtype=np.float64)
+    semantic = np.ascontiguousarray(semantic_scores, dtype=np.float64)
+    return np.round(
+        ((1 - semantic_weight) * tfidf + semantic_weight * semantic) * 100,
+        2
+    )
 
 
 def evaluate_candidate(
@@ -14,76 +121,58 @@ def evaluate_candidate(
     resume_skills: list,
     jd_text: str,
     jd_skills: list,
+    jd_embedding=None,
 ):
     """
     Evaluates a candidate against a job description using:
     - TF-IDF similarity (keyword level)
     - Semantic similarity (meaning level)
     - Skill overlap with semantic tolerance
+
+    Pass a pre-computed `jd_embedding` (see `encode_text`) to skip
+    re-encoding the same JD for every candidate.
     """
 
     # -------------------------------
     # 1. TF-IDF Similarity (baseline)
     # -------------------------------
-    tfidf = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = tfidf.fit_transform([resume_text, jd_text])
-    tfidf_score = cosine_similarity(
-        tfidf_matrix[0:1],
-        tfidf_matrix[1:2]
-    )[0][0]
+    tfidf_score = compute_tfidf_similarity(resume_text, jd_text)
 
     # -----------------------------------
     # 2. Semantic Similarity (PRIMARY)
     # -----------------------------------
-    embeddings = SEMANTIC_MODEL.encode(
-        [resume_text, jd_text],
-        convert_to_numpy=True
-    )
-
-    semantic_score = cosine_similarity(
-        [embeddings[0]],
-        [embeddings[1]]
-    )[0][0]
+    semantic_score = compute_semantic_similarity(resume_text, jd_text, jd_embedding)
 
     # -----------------------------------
     # 3. Skill Matching (SMART LOGIC)
     # -----------------------------------
-    matched_skills = []
-    missing_skills = []
-
-    resume_skills_lower = [s.lower() for s in resume_skills]
-
-    for jd_skill in jd_skills:
-        jd_skill_lower = jd_skill.lower()
-
-        # Direct keyword match
-        if jd_skill_lower in resume_skills_lower:
-            matched_skills.append(jd_skill)
-            continue
-
-        # Semantic skill match (sub-skill tolerance)
-        skill_embeddings = SEMANTIC_MODEL.encode(
-            [jd_skill_lower] + resume_skills_lower,
-            convert_to_numpy=True
-        )
-
-        jd_emb = skill_embeddings[0]
-        resume_embs = skill_embeddings[1:]
-
-        similarities = cosine_similarity(
-            [jd_emb],
-            resume_embs
-        )[0]
-
-        # Threshold tuned for MAX accuracy
-        if np.max(similarities) >= 0.70:
-            matched_skills.append(jd_skill)
-        else:
-            missing_skills.append(jd_skill)
+    resume_skill_set = frozenset(s.lower() for s in resume_skills)
+    jd_map = {s.lower(): s for s in jd_skills}  # lowercase -> original, JD order
+
+    # Direct keyword match: one C-level set intersection
+    matched_keys = jd_map.keys() & resume_skill_set
+    unmatched_keys = [k for k in jd_map if k not in matched_keys]
+
+    # Semantic skill match (sub-skill tolerance), only for JD skills with
+    # no direct hit: embed each side once, one GEMM for all cosine scores
+    if unmatched_keys and resume_skill_set:
+        # one call, so labels outside SKILL_LIST share a single forward pass
+        skill_embs = _encode_skills(unmatched_keys + list(resume_skill_set))
+        jd_embs = skill_embs[:len(unmatched_keys)]
+        resume_embs = skill_embs[len(unmatched_keys):]
+        best_scores = (jd_embs @ resume_embs.T).max(axis=1)
+        matched_keys |= {
+            k for k, hit in zip(unmatched_keys, best_scores >= SKILL_MATCH_THRESHOLD)
+            if hit
+        }
+
+    matched_skills = [jd_map[k] for k in jd_map if k in matched_keys]
+    missing_skills = [jd_map[k] for k in jd_map if k not in matched_keys]
 
     return {
         "tfidf_score": round(float(tfidf_score), 4),
         "semantic_score": round(float(semantic_score), 4),
-        "matched_skills": sorted(list(set(matched_skills))),
-        "missing_skills": sorted(list(set(missing_skills))),
+        # already unique (built from jd_map keys) and in JD order
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
     }
@@ -1,8 +1,17 @@
 # utils.py
 
+import os
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+
+import numpy as np
+
 # Master skill list for matching in parser + analyzer
 # Add more as needed — this list is used in parser and matcher
-SKILL_LIST = [
+# (a tuple: immutable, and tuple(SKILL_LIST) cache keys cost nothing)
+SKILL_LIST = (
     "python", "java", "javascript", "typescript", "c++", "c", "c#",
     "html", "css", "react", "node", "express", "angular",
     "flask", "django", "fastapi",
@@ -17,8 +26,99 @@ SKILL_LIST = [
     "git", "github", "devops",
 
     "communication", "leadership"
-]
+)
+
+# Lowercase skill -> its SKILL_LIST position (row in skill_list_embeddings());
+# the one lowercase view, also used for membership tests / canonical display
+SKILL_INDEX = {s.lower(): i for i, s in enumerate(SKILL_LIST)}
 
-# Clean skill text helper
+# Clean skill text helper (canonical SKILL_LIST spelling when known)
 def normalize_skill(skill: str) -> str:
-    return skill.strip().lower()
+    key = skill.strip().lower()
+    row = SKILL_INDEX.get(key)
+    return key if row is None else SKILL_LIST[row]
+
+
+# -----------------------------
+# Shared semantic model (parser + skill_matcher)
+# -----------------------------
+SEMANTIC_MODEL_NAME = "all-mpnet-base-v2"
+
+# Dynamic int8 export shipped with the model on the HF Hub (CPU only)
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+@lru_cache(maxsize=1)
+def load_semantic_model():
+    """
+    Load the sentence-transformer once for the whole app.
+    CUDA: FP16 PyTorch. CPU: int8 ONNX Runtime if available, else FP32.
+    Returns (model, device, backend).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    if device == "cuda":
+        model = SentenceTransformer(SEMANTIC_MODEL_NAME, device=device)
+        model.half()  # FP16: faster encode, negligible cosine drift
+        return model, device, "torch-fp16"
+
+    try:
+        # needs sentence-transformers>=3.2 + optimum[onnxruntime]
+        model = SentenceTransformer(
+            SEMANTIC_MODEL_NAME,
+            device=device,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_INT8_FILE}
+        )
+        return model, device, "onnx-int8"
+    except Exception:
+        logging.warning("ONNX int8 backend not available, using PyTorch FP32")
+        return SentenceTransformer(SEMANTIC_MODEL_NAME, device=device), device, "torch-fp32"
+
+
+# Precomputed SKILL_LIST embeddings live next to the reports
+SKILL_EMBEDDINGS_DIR = os.path.join("data", "outputs")
+
+
+# Every Streamlit session warms the embeddings at startup; one fills the cache
+_SKILL_EMBEDDINGS_LOCK = threading.Lock()
+
+
+def skill_list_embeddings():
+    """
+    Unit-normalized embeddings of SKILL_LIST (row i is SKILL_LIST[i]).
+    Encoded on first run, saved as .npy and memory-mapped afterwards.
+    """
+    with _SKILL_EMBEDDINGS_LOCK:
+        return _load_skill_list_embeddings()
+
+
+@lru_cache(maxsize=1)
+def _load_skill_list_embeddings():
+    model, _, backend = load_semantic_model()
+
+    key = hashlib.blake2b(
+        repr((SEMANTIC_MODEL_NAME, backend, tuple(SKILL_LIST))).encode(),
+        digest_size=8
+    ).hexdigest()
+    path = os.path.join(SKILL_EMBEDDINGS_DIR, f"skill_embeddings_{key}.npy")
+
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    embs = model.encode(
+        list(SKILL_LIST),
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+
+    os.makedirs(SKILL_EMBEDDINGS_DIR, exist_ok=True)
+    # pid + thread: sessions share one process, so the pid is not unique
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, embs)
+    os.replace(tmp_path, path)
+    return embs
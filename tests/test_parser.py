@@ -0,0 +1,25 @@
+# tests/test_parser.py
+
+import pytest
+
+# parser loads spaCy (and the PDF backend) at import
+pytest.importorskip("spacy")
+pytest.importorskip("phonenumbers")
+
+from modules import parser  # noqa: E402
+
+
+@pytest.mark.parametrize("text, skills, expected", [
+    # skills ending in punctuation must not backtrack to a shorter skill
+    ("C++11", ["C", "C++"], ["C++"]),
+    ("C#.NET", ["C", "C#"], ["C#"]),
+    # word-character ends still need a word boundary
+    ("ABC, Cython", ["C"], []),
+    ("Pythonic code", ["Python"], []),
+])
+def test_extract_skills_by_keyword_boundaries(text, skills, expected):
+    assert parser.extract_skills_by_keyword(text, skills) == expected
+
+
+def test_extract_skills_by_keyword_empty_list():
+    assert parser.extract_skills_by_keyword("python", []) == []